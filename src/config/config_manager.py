@@ -1,8 +1,11 @@
 import yaml
 import os
+import re
 from typing import Any, Dict
 from src.utils.logger import LoggerFactory
 
+_ENV_RE = re.compile(r'^\$\{([^}]+)\}$')
+
 class ConfigManager:
     def __init__(self, config_path='config/config.yaml'):
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
@@ -11,57 +14,62 @@ class ConfigManager:
 
     
     def _load_config(self) -> Dict[str, Any]:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         with open(self.config_path, 'r') as f:
             config = yaml.safe_load(f)
-        return self._resolve_env_variables(config)
+        config = self._resolve_env_variables(config)
+        self._flat = self._flatten(config)
+        return config
 
-    def _resolve_env_variables(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+    @staticmethod
+    def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+        # Noktalı anahtarlarla tek seviyeli bir sözlük oluştur;
+        # ara sözlükler de saklanır ki get('data_collection') çalışmaya devam etsin
+        flat = {}
+        stack = [('', config)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                dotted = f"{prefix}{key}"
+                flat[dotted] = value
+                if isinstance(value, dict):
+                    stack.append((f"{dotted}.", value))
+        return flat
 
-        for key, value in config.items():
-            if isinstance(value, dict):
-                config[key] = self._resolve_env_variables(value)
-            elif isinstance(value, str) and value.startswith('${') and value.endswith('}'):
-                env_var = value[2:-1]
-                config[key] = os.getenv(env_var)
-                if config[key] is None:
-                    self.logger.warning(f"Environment variable {env_var} is not set")
+    def _resolve_env_variables(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        env = os.environ
+        stack = [config]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, str):
+                    match = _ENV_RE.match(value)
+                    if match:
+                        node[key] = env.get(match.group(1))
+                        if node[key] is None:
+                            self.logger.warning(f"Environment variable {match.group(1)} is not set")
         return config
 
     def get(self, key: str, default: Any = None) -> Any:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
+        value = self._flat.get(key)
         return value if value is not None else default
 
     def set(self, key: str, value: Any) -> None:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         keys = key.split('.')
         config = self.config
         for k in keys[:-1]:
             config = config.setdefault(k, {})
         config[keys[-1]] = value
+        self._flat = self._flatten(self.config)
 
     
     def save(self) -> None:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         with open(self.config_path, 'w') as f:
             yaml.dump(self.config, f)
         self.logger.info(f"Configuration saved to {self.config_path}")
 
     def reload(self) -> None:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-        
         self.config = self._load_config()
         self.logger.info("Configuration reloaded")
 
@@ -1,6 +1,9 @@
 import time
-import json
+import logging
+import orjson
+import pandas as pd
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from src.data.data_processor import create_data_processor
 from src.data.hopsworks_uploader import create_hopsworks_uploader
@@ -21,12 +24,22 @@ class DataSaver(ABC):
 class JsonDataSaver(DataSaver):
     def save(self, data: List[Dict[str, Any]], path: str):
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             self.logger.info(f"Total {len(data)} data points were collected and recorded.")
         except IOError as e:
             self.logger.error(f"Failed to save data to {path}: {e}")
 
+class ParquetDataSaver(DataSaver):
+    def save(self, data: List[Dict[str, Any]], path: str):
+        if path.endswith('.json'):
+            path = path[:-len('.json')] + '.parquet'
+        try:
+            pd.json_normalize(data, sep='_').to_parquet(path, compression='zstd', index=False)
+            self.logger.info(f"Total {len(data)} data points were collected and recorded.")
+        except (IOError, OSError) as e:
+            self.logger.error(f"Failed to save data to {path}: {e}")
+
 class DataUploader(ABC):
     def __init__(self):
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
@@ -53,39 +66,56 @@ class DataCollector:
         self.data_saver = data_saver
         self.data_uploader = data_uploader
         self.data_fetcher = DataFetcher()
+        self._fetch_executor = ThreadPoolExecutor(max_workers=2)
         self.data_processor = create_data_processor()
         self.postgresql_connector = PostgreSQLConnector(config.get('db_url'))
 
     @ErrorHandler.handle_errors("DataCollector")
     def collect_data(self) -> List[Dict[str, Any]]:
         all_data = []
+        pending_inserts = []
         start_time = time.time()
         collection_time = self.config.get('data_collection', {}).get('total_collection_time', 3600)
         interval = self.config.get('data_collection', {}).get('request_interval', 300)
-        
+        insert_batch_size = self.config.get('data_collection', {}).get('insert_batch_size', 10)
+        next_deadline = start_time
+
         while time.time() - start_time < collection_time:
-            raw_aqi_data = self.data_fetcher.fetch_air_quality_data()
-            carbon_data = self.data_fetcher.fetch_carbon_intensity_data()
-            
+            # İki API çağrısını aynı anda başlat
+            aqi_future = self._fetch_executor.submit(self.data_fetcher.fetch_air_quality_data)
+            carbon_future = self._fetch_executor.submit(self.data_fetcher.fetch_carbon_intensity_data)
+            raw_aqi_data = aqi_future.result()
+            carbon_data = carbon_future.result()
+
             processed_data = self.data_processor.process_all_data(raw_aqi_data, carbon_data)
             if processed_data:
                 all_data.append(processed_data)
-                self.logger.info("Data processed successfully: %s", json.dumps(processed_data, indent=2))
+                self.logger.info("Data processed successfully")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Processed data: %s", processed_data)
+
+                # PostgreSQL'e toplu veri ekleme
+                pending_inserts.append(processed_data)
+                if len(pending_inserts) >= insert_batch_size:
+                    self.postgresql_connector.insert_data(pending_inserts)
+                    pending_inserts = []
 
-                # PostgreSQL'e veri ekleme
-                self.postgresql_connector.insert_data(processed_data)
-                
                 # Hopsworks'e veri yükleme
                 self.data_uploader.upload(processed_data)
-                    
-            time_elapsed = time.time() - start_time
-            time_remaining = collection_time - time_elapsed
-            if time_remaining > interval:
-                self.logger.info("Waiting for %s seconds...", interval)
-                time.sleep(interval)
-            else:
+
+            # Bir sonraki örnekleme zamanına kadar bekle; fetch süresi
+            # programı kaydırmasın diye sabit deadline'lar kullanılır
+            next_deadline += interval
+            if next_deadline - start_time >= collection_time:
                 break
-        
+            sleep_time = next_deadline - time.time()
+            if sleep_time > 0:
+                self.logger.info("Waiting for %.1f seconds...", sleep_time)
+                time.sleep(sleep_time)
+
+        if pending_inserts:
+            self.postgresql_connector.insert_data(pending_inserts)
+
         return all_data
 
     @ErrorHandler.handle_errors("DataCollector")
@@ -93,7 +123,8 @@ class DataCollector:
         self.data_saver.save(data, path)
 
 def create_data_collector(config: ConfigManager) -> DataCollector:
-    data_saver = JsonDataSaver()
+    output_format = config.get('output.format', 'parquet')
+    data_saver = JsonDataSaver() if output_format == 'json' else ParquetDataSaver()
     hopsworks_uploader = create_hopsworks_uploader(config)
     data_uploader = HopsworksDataUploader(hopsworks_uploader)
     return DataCollector(config, data_saver, data_uploader)
\ No newline at end of file
@@ -1,5 +1,5 @@
 import requests
-from functools import lru_cache
+from requests.adapters import HTTPAdapter
 import os
 from dotenv import load_dotenv
 import json
@@ -9,9 +9,21 @@ from src.utils.logger import LoggerFactory
 
 load_dotenv()
 
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Tüm fetcher'lar aynı bağlantı havuzunu paylaşır; TLS el sıkışması
+# süreç başına bir kez yapılır
+_shared_session = _create_session()
+
 class APIFetcher(ABC):
     def __init__(self):
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+        self.session = _shared_session
 
     @abstractmethod
     def fetch(self) -> Optional[Dict[str, Any]]:
@@ -23,14 +35,13 @@ class AirQualityFetcher(APIFetcher):
         self.api_url = api_url
         self.api_token = api_token
 
-    @lru_cache(maxsize=1)
     def fetch(self) -> Optional[Dict[str, Any]]:
         params = {"token": self.api_token}
         return self._fetch_data(self.api_url, params=params)
 
     def _fetch_data(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = self.session.get(url, params=params, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -45,7 +56,6 @@ class CarbonIntensityFetcher(APIFetcher):
         self.city_lat = city_lat
         self.city_lon = city_lon
 
-    @lru_cache(maxsize=1)
     def fetch(self) -> Optional[Dict[str, Any]]:
         headers = {"auth-token": self.api_token}
         params = {"lat": self.city_lat, "lon": self.city_lon}
@@ -56,7 +66,7 @@ class CarbonIntensityFetcher(APIFetcher):
 
     def _fetch_data(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = self.session.get(url, params=params, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
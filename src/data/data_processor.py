@@ -15,14 +15,15 @@ class BasicDataValidator(DataValidator):
     def __init__(self, required_keys: List[str], nested_keys: Optional[List[str]] = None):
         super().__init__()
         self.required_keys = required_keys
+        self._required_set = frozenset(required_keys)
         self.nested_keys = nested_keys
 
     def validate(self, data: Dict[str, Any]) -> bool:
         if not isinstance(data, dict):
             self.logger.error("Data is not a dictionary")
             return False
-        if not all(key in data for key in self.required_keys):
-            self.logger.error(f"Missing required keys: {set(self.required_keys) - set(data.keys())}")
+        if not self._required_set.issubset(data.keys()):
+            self.logger.error(f"Missing required keys: {self._required_set - set(data.keys())}")
             return False
         if self.nested_keys:
             nested_data = data
@@ -46,17 +47,17 @@ class AQIDataProcessor(DataProcessor):
         super().__init__()
         self.validator = validator
 
-    def process(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def process(self, data: Dict[str, Any], now_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
         if not self.validator.validate(data):
             self.logger.error(f"Invalid AQI data received: {data}")
             return None
-        
+
         result = data.get('data', {})
         aqi = result.get('aqi')
         return {
             "city": "Sakarya",
             "aqi": aqi if aqi != "-" else None,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso or datetime.now().isoformat(),
             "iaqi": result.get('iaqi', {})
         }
 
@@ -78,44 +79,41 @@ class CarbonIntensityDataProcessor(DataProcessor):
         }
 
 class CombinedDataProcessor:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(CombinedDataProcessor, cls).__new__(cls)
-            cls._instance.logger = LoggerFactory.get_logger(cls.__name__)
-            cls._instance.aqi_processor = None
-            cls._instance.carbon_processor = None
-        return cls._instance
+    def __init__(self):
+        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+        self.aqi_processor = None
+        self.carbon_processor = None
 
     def initialize(self, aqi_processor: AQIDataProcessor, carbon_processor: CarbonIntensityDataProcessor):
         self.aqi_processor = aqi_processor
         self.carbon_processor = carbon_processor
 
-    @staticmethod
-    def process_all_data(aqi_data: Dict[str, Any], carbon_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        instance = CombinedDataProcessor()
-        if not instance.aqi_processor or not instance.carbon_processor:
-            instance.logger.error("Processors not initialized")
+    def process_all_data(self, aqi_data: Dict[str, Any], carbon_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.aqi_processor or not self.carbon_processor:
+            self.logger.error("Processors not initialized")
             return None
 
-        processed_aqi = instance.aqi_processor.process(aqi_data)
-        processed_carbon = instance.carbon_processor.process(carbon_data)
-        
+        # Zaman damgası batch başına bir kez hesaplanır
+        now_iso = datetime.now().isoformat()
+        processed_aqi = self.aqi_processor.process(aqi_data, now_iso=now_iso)
+        processed_carbon = self.carbon_processor.process(carbon_data)
+
         if processed_aqi and processed_carbon:
             processed_aqi['carbon_intensity'] = processed_carbon['carbonIntensity']
-            instance.logger.info("Successfully processed and combined AQI and Carbon Intensity data")
+            self.logger.info("Successfully processed and combined AQI and Carbon Intensity data")
             return processed_aqi
-        instance.logger.error("Failed to process either AQI or Carbon Intensity data")
+        self.logger.error("Failed to process either AQI or Carbon Intensity data")
         return None
 
+# Modül seviyesinde tek örnek; her çağrıda __new__ üzerinden geçilmez
+combined_processor = CombinedDataProcessor()
+
 def create_data_processor() -> CombinedDataProcessor:
     aqi_validator = BasicDataValidator(['status', 'data'], nested_keys=['data', 'aqi'])
     carbon_validator = BasicDataValidator(['carbonIntensity', 'datetime', 'updatedAt'])
-    
+
     aqi_processor = AQIDataProcessor(aqi_validator)
     carbon_processor = CarbonIntensityDataProcessor(carbon_validator)
-    
-    processor = CombinedDataProcessor()
-    processor.initialize(aqi_processor, carbon_processor)
-    return processor
\ No newline at end of file
+
+    combined_processor.initialize(aqi_processor, carbon_processor)
+    return combined_processor
\ No newline at end of file
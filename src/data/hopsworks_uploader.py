@@ -15,47 +15,95 @@ from hsfs.feature import Feature
 from src.data.postgresql_connector import PostgreSQLConnector
 from src.config.config_manager import ConfigManager
 
+# Hopsworks'e gönderilen batch'in hedef şeması; dar tipler hem bellek
+# hem de ağ bant genişliğini yarıya indirir (aqi 0-500, carbon_intensity 0-1000)
+UPLOAD_SCHEMA_DTYPES = {
+    'city': 'int8',
+    'aqi': 'float32',
+    'carbon_intensity': 'int16',
+    **{c: 'float32' for c in PostgreSQLConnector.COLUMNS if c.startswith('iaqi_')},
+}
+
 class DataValidator(ABC):
     @abstractmethod
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
         pass
 
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Varsayılan: satır bazlı doğrulama; alt sınıflar vektörel sürümü sağlar
+        return pd.DataFrame([self.validate(row) for row in df.to_dict('records')])
+
 class SchemaValidator(DataValidator):
     def __init__(self, expected_columns: List[str]):
         self._expected_columns = expected_columns
 
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        missing_columns = set(self._expected_columns) - set(data.keys())
+        self._check_missing(set(data.keys()))
+        return data
+
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        self._check_missing(set(df.columns))
+        return df
+
+    def _check_missing(self, present: set):
+        missing_columns = set(self._expected_columns) - present
         if missing_columns:
             if 'iaqi' in missing_columns:
                 # 'iaqi' eksikse, diğer iaqi_* sütunlarının varlığını kontrol et
-                iaqi_columns = [col for col in data.keys() if col.startswith('iaqi_')]
+                iaqi_columns = [col for col in present if col.startswith('iaqi_')]
                 if iaqi_columns:
                     missing_columns.remove('iaqi')
             if missing_columns:
                 raise ValueError(f"Eksik sütunlar: {missing_columns}")
-        return data
 
 class TypeValidator(DataValidator):
     def __init__(self, expected_types: Dict[str, type]):
         self._expected_types = expected_types
+        # Şema kurulumda sabit; dönüşümler tek fonksiyona satır içi derlenir,
+        # satır başına dict iterasyonu ve tip dağıtımı kalmaz
+        self._coerce = self._compile_coercer(expected_types)
+
+    @staticmethod
+    def _compile_coercer(expected_types: Dict[str, type]):
+        namespace = {}
+        lines = []
+        for i, (column, expected_type) in enumerate(expected_types.items()):
+            namespace[f'_type{i}'] = expected_type
+            if expected_type is float:
+                default = "float('nan')"
+            elif expected_type is int:
+                default = "-1"
+            else:
+                default = "'N/A'"
+            lines += [
+                f"    if {column!r} in d:",
+                f"        v = d[{column!r}]",
+                f"        if v is None:",
+                f"            d[{column!r}] = {default}",
+                f"        elif not isinstance(v, _type{i}):",
+                f"            try:",
+                f"                d[{column!r}] = _type{i}(v)",
+                f"            except ValueError:",
+                f"                raise ValueError(\"Geçersiz veri tipi: {column} sütunu {expected_type} olmalı\")",
+            ]
+        source = "def _coerce(d):\n" + "\n".join(lines) + "\n    return d"
+        exec(source, namespace)
+        return namespace['_coerce']
 
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._coerce(data)
+
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
         for column, expected_type in self._expected_types.items():
-            if column in data:
-                if data[column] is None:
-                    if expected_type == float:
-                        data[column] = float('nan')  # veya başka bir uygun değer, örneğin 0.0
-                    elif expected_type == int:
-                        data[column] = -1  # veya başka bir uygun değer
-                    else:
-                        data[column] = "N/A"  # veya başka bir uygun değer
-                elif not isinstance(data[column], expected_type):
-                    try:
-                        data[column] = expected_type(data[column])
-                    except ValueError:
-                        raise ValueError(f"Geçersiz veri tipi: {column} sütunu {expected_type} olmalı")
-        return data
+            if column not in df.columns:
+                continue
+            if expected_type == float:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+            elif expected_type == int:
+                df[column] = pd.to_numeric(df[column], errors='coerce').fillna(-1).astype('int64')
+            else:
+                df[column] = df[column].fillna("N/A").astype(str)
+        return df
 
 class OutlierDetector(DataValidator):
     def __init__(self, value_ranges: Dict[str, tuple]):
@@ -68,6 +116,12 @@ class OutlierDetector(DataValidator):
                     data[column] = np.clip(data[column], min_val, max_val)
         return data
 
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        for column, (min_val, max_val) in self._value_ranges.items():
+            if column in df.columns:
+                df[column] = df[column].clip(min_val, max_val)
+        return df
+
 class MissingValueHandler(DataValidator):
     def __init__(self, numeric_columns: List[str]):
         self._numeric_columns = numeric_columns
@@ -78,15 +132,30 @@ class MissingValueHandler(DataValidator):
                 data[column] = -1  # veya başka bir uygun değer
         return data
 
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.fillna({column: -1 for column in self._numeric_columns})
+
 class ConsistencyChecker(DataValidator):
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if 'timestamp' in data:
+            # ISO-8601 dizeleri sözlüksel olarak kronolojik sıralanır; aralık
+            # kontrolü için satır başına parse + yeniden serileştirme gerekmez
             current_time = datetime.now()
-            data_time = datetime.fromisoformat(data['timestamp'])
-            if data_time > current_time or data_time < current_time - timedelta(days=1):
-                data['timestamp'] = current_time.isoformat()
+            lower_bound = (current_time - timedelta(days=1)).isoformat()
+            upper_bound = current_time.isoformat()
+            ts = data['timestamp']
+            if not isinstance(ts, str) or not (lower_bound <= ts <= upper_bound):
+                data['timestamp'] = upper_bound
         return data
 
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        if 'timestamp' in df.columns:
+            now = pd.Timestamp.now()
+            ts = pd.to_datetime(df['timestamp'], errors='coerce')
+            bad = ts.isna() | (ts > now) | (ts < now - pd.Timedelta(days=1))
+            df['timestamp'] = ts.where(~bad, now)
+        return df
+
 class IntegrityEnsurer(DataValidator):
     def __init__(self, expected_columns: List[str], expected_types: Dict[str, type]):
         self._expected_columns = expected_columns
@@ -103,14 +172,60 @@ class IntegrityEnsurer(DataValidator):
                     data[field] = "N/A"  # veya başka bir uygun değer
         return data
 
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        for field in self._expected_columns:
+            if field == 'iaqi' and field not in df.columns:
+                # DB'den gelen satırlar zaten iaqi_* olarak düzleştirilmiş
+                continue
+            if field not in df.columns:
+                if field == 'timestamp':
+                    df[field] = datetime.now().isoformat()
+                elif self._expected_types.get(field) in (int, float):
+                    df[field] = -1
+                else:
+                    df[field] = "N/A"
+            elif self._expected_types.get(field) in (int, float):
+                df[field] = df[field].fillna(-1)
+        return df
+
 class DataPreprocessor:
+    # Değere (şekle değil) bağlı doğrulayıcılar; ısınan önbellekte de çalışır
+    _DATA_DEPENDENT = (OutlierDetector, MissingValueHandler, ConsistencyChecker)
+
     def __init__(self, validators: List[DataValidator]):
         self._validators = validators
+        self._seen_shapes = set()
+        self._full_pipeline = self._compile_pipeline([v.validate for v in validators])
+        self._fast_pipeline = self._compile_pipeline(
+            [v.validate for v in validators if isinstance(v, self._DATA_DEPENDENT)])
+
+    @staticmethod
+    def _compile_pipeline(steps):
+        # Adım listesi kurulumda sabittir; zincir tek fonksiyona derlenir,
+        # kayıt başına liste iterasyonu ve metot araması kalmaz
+        namespace = {f'_validate{i}': step for i, step in enumerate(steps)}
+        body = "\n".join(f"    data = _validate{i}(data)" for i in range(len(steps)))
+        exec("def _pipeline(data):\n" + body + "\n    return data", namespace)
+        return namespace['_pipeline']
 
     def preprocess(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        for validator in self._validators:
-            data = validator.validate(data)
+        # Aynı anahtar kümesi + tip imzası daha önce doğrulandıysa şema/tip
+        # adımları atlanır; yalnızca değere bağlı doğrulayıcılar çalışır.
+        # Önbelleğe tam zincir SONRASI imza yazılır: dönüşüm gerektiren bir
+        # kayıt (None/str/int değerler) bu imzayla asla eşleşemez ve her
+        # seferinde tam zincirden geçer
+        fingerprint = (frozenset(data), tuple(type(v) for v in data.values()))
+        if fingerprint in self._seen_shapes:
+            return self._fast_pipeline(data)
+        data = self._full_pipeline(data)
+        self._seen_shapes.add((frozenset(data), tuple(type(v) for v in data.values())))
         return data
+
+    def preprocess_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Tüm batch tek geçişte doğrulanır; satır başına Python çağrısı yok
+        for validator in self._validators:
+            df = validator.validate_frame(df)
+        return df
 class DataPreprocessorFactory:
     @staticmethod
     def create() -> DataPreprocessor:
@@ -169,6 +284,8 @@ class HopsworksUploader:
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
         self._feature_group_name = os.getenv('HW_FEATURE_GN')
         self._batch_size = config.get('hopsworks.batch_size', 1000)
+        # Gözlenen başarıya göre uyarlanan batch boyutu (AIMD)
+        self._cur_batch = self._batch_size
         self._retry_attempts = config.get('hopsworks.retry_attempts', 3)
         self._retry_delay = config.get('hopsworks.retry_delay', 5)
         self.postgresql_connector = PostgreSQLConnector(config.get('db_url'))
@@ -187,38 +304,43 @@ class HopsworksUploader:
     @ErrorHandler.retry(max_attempts=3, delay=5)
     def upload_data_from_postgresql(self, batch_size=None):
         if batch_size is None:
-            batch_size = self._batch_size
+            batch_size = self._cur_batch
 
         fs = self._connector.get_feature_store()
         
         try:
-            # PostgreSQL'den veri çekme
-            data_batch = self.postgresql_connector.fetch_data(limit=batch_size)
-            
-            if not data_batch:
+            # PostgreSQL'den satırları akıtarak doğrudan DataFrame'e yaz;
+            # arada dict listesi materialize edilmez
+            df = self.postgresql_connector.fetch_dataframe(limit=batch_size)
+
+            if df.empty:
                 self.logger.info("No new data to upload to Hopsworks.")
                 return
 
-            # Veriyi pandas DataFrame'e dönüştür
-            df = pd.DataFrame(data_batch)
-            
-            # Veri tiplerini düzelt
-            df['city'] = 1  # varchar(25) için
-            df['city'] = df['city'].astype('int')  # int için
-            df['carbon_intensity'] = df['carbon_intensity'].astype('int')  # int için
-            # timestamp sütununu datetime objesine çevir ve formatı düzenle
-            #df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # timestamp sütununu datetime objesine çevir ve UTC'ye dönüştür
-            #df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize('UTC')
-            # timestamp sütununu null yap
-            df.drop('timestamp', axis=1, inplace=True)
-
-            df['aqi'] = df['aqi'].fillna(-1)
-
-            # Veri özeti ve son birkaç satırı logla
-            self.logger.info(f"Yüklenecek veri özeti:\n{df.describe()}")
-            self.logger.info(f"Son 5 satır:\n{df.head()}")
+            # Şema zaten düz (iaqi_* sütunları DB'den gelir); iaqi sözlük sütunu
+            # varsa batch'in tamamı tek normalize geçişiyle düzleştirilir
+            if 'iaqi' in df.columns:
+                iaqi_cols = pd.json_normalize(df.pop('iaqi')).add_prefix('iaqi_')
+                v_cols = [c for c in iaqi_cols.columns if c.endswith('.v')]
+                iaqi_cols = iaqi_cols[v_cols]
+                iaqi_cols.columns = [c[:-len('.v')] for c in iaqi_cols.columns]
+                iaqi_cols.index = df.index
+                df = pd.concat([df, iaqi_cols], axis=1)
+
+            # Batch'i tek geçişte doğrula
+            df = self._preprocessor.preprocess_frame(df)
+
+            # Şemayı tek astype geçişiyle uygula; timestamp Hopsworks'e gönderilmez
+            # (aqi/carbon_intensity null değerleri preprocess_frame'de -1 ile dolduruldu)
+            df = df.drop(columns='timestamp')
+            df['city'] = 1  # varchar(25) yerine int kimlik
+            df = df.astype(UPLOAD_SCHEMA_DTYPES)
+
+            # Veri özeti ve ilk birkaç satır yalnızca DEBUG seviyesinde loglanır;
+            # describe() her sayısal sütun üzerinde 8 indirgeme yapar
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Yüklenecek veri özeti:\n%s", df.describe())
+                self.logger.debug("İlk 5 satır:\n%s", df.head())
 
             # Feature Group'u al veya oluştur
             fg = fs.get_or_create_feature_group(
@@ -230,7 +352,11 @@ class HopsworksUploader:
             fg.insert(df)
             self.logger.info(f"{len(df)} veri noktası başarıyla Hopsworks'e yüklendi.")
 
+            # Başarıda batch boyutunu büyüt, hatada yarıya indir
+            self._cur_batch = min(self._cur_batch * 2, 10000)
+
         except Exception as e:
+            self._cur_batch = max(self._cur_batch // 2, 100)
             self.logger.error(f"Veri Hopsworks'e yüklenemedi: {e}", exc_info=True)
             raise
 
@@ -264,15 +390,16 @@ class HopsworksUploader:
     @error_handler
     def _prepare_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            processed_data = self._preprocessor.preprocess(data)
-            if processed_data['aqi'] is None:
-                processed_data['aqi'] = -1
-            return processed_data
+            # None aqi değerleri MissingValueHandler tarafından doldurulur;
+            # burada ikinci bir kontrol gerekmez
+            return self._preprocessor.preprocess(data)
         except Exception as e:
             self.logger.error(f"_prepare_data metodunda hata oluştu: {str(e)}")
             raise
     
     def _flatten_iaqi(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Sadece tek kayıtlık eski çağrılar için; batch yolu DataFrame
+        # üzerinde json_normalize ile düzleştirir
         if 'iaqi' not in data:
             self.logger.warning(f"'iaqi' anahtarı veride bulunamadı. Veri zaten düzleştirilmiş olabilir.")
             return data
@@ -1,12 +1,20 @@
+import pandas as pd
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from src.utils.logger import LoggerFactory
 from src.utils.error_handler import ErrorHandler
 
 class PostgreSQLConnector:
+    COLUMNS = ('city', 'aqi', 'timestamp', 'carbon_intensity',
+               'iaqi_co', 'iaqi_dew', 'iaqi_h', 'iaqi_no2', 'iaqi_o3', 'iaqi_p',
+               'iaqi_pm10', 'iaqi_pm25', 'iaqi_so2', 'iaqi_t', 'iaqi_w')
+
     def __init__(self, db_url):
         self.db_url = db_url
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+        self._pool = None
         if not self.db_url:
             self.logger.error("Database URL is not set. Please check your configuration.")
         else:
@@ -18,11 +26,12 @@ class PostgreSQLConnector:
     def connect(self):
         if not self.db_url:
             raise ValueError("Database URL is not set. Please check your configuration.")
-        self.logger.info("Attempting to connect to the database...")
         try:
-            conn = psycopg2.connect(self.db_url)
-            self.logger.info("Successfully connected to the database.")
-            return conn
+            if self._pool is None:
+                # Havuz ilk kullanımda kurulur; sonraki çağrılar el sıkışma maliyeti ödemez
+                self._pool = ThreadedConnectionPool(1, 8, self.db_url)
+                self.logger.info("Database connection pool initialized.")
+            return self._pool.getconn()
         except psycopg2.OperationalError as e:
             self.logger.error(f"Failed to connect to the database: {str(e)}")
             raise
@@ -30,65 +39,116 @@ class PostgreSQLConnector:
             self.logger.error(f"Unexpected error while connecting to the database: {str(e)}")
             raise
 
+    def release(self, conn):
+        if conn is not None and self._pool is not None:
+            self._pool.putconn(conn)
+
+    def _to_row(self, data):
+        iaqi = data['iaqi']
+        return (
+            data['city'],
+            data['aqi'],
+            data['timestamp'],
+            data['carbon_intensity'],
+            iaqi.get('co', {}).get('v'),
+            iaqi.get('dew', {}).get('v'),
+            iaqi.get('h', {}).get('v'),
+            iaqi.get('no2', {}).get('v'),
+            iaqi.get('o3', {}).get('v'),
+            iaqi.get('p', {}).get('v'),
+            iaqi.get('pm10', {}).get('v'),
+            iaqi.get('pm25', {}).get('v'),
+            iaqi.get('so2', {}).get('v'),
+            iaqi.get('t', {}).get('v'),
+            iaqi.get('w', {}).get('v')
+        )
+
     @ErrorHandler.handle_errors("PostgreSQLConnector")
-    def insert_data(self, data):
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                insert_query = sql.SQL("""
-                    INSERT INTO air_quality 
-                    (city, aqi, timestamp, carbon_intensity, iaqi_co, iaqi_dew, iaqi_h, iaqi_no2, iaqi_o3, iaqi_p, iaqi_pm10, iaqi_pm25, iaqi_so2, iaqi_t, iaqi_w)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """)
-                cur.execute(insert_query, (
-                    data['city'],
-                    data['aqi'],
-                    data['timestamp'],
-                    data['carbon_intensity'],
-                    data['iaqi'].get('co', {}).get('v'),
-                    data['iaqi'].get('dew', {}).get('v'),
-                    data['iaqi'].get('h', {}).get('v'),
-                    data['iaqi'].get('no2', {}).get('v'),
-                    data['iaqi'].get('o3', {}).get('v'),
-                    data['iaqi'].get('p', {}).get('v'),
-                    data['iaqi'].get('pm10', {}).get('v'),
-                    data['iaqi'].get('pm25', {}).get('v'),
-                    data['iaqi'].get('so2', {}).get('v'),
-                    data['iaqi'].get('t', {}).get('v'),
-                    data['iaqi'].get('w', {}).get('v')
-                ))
-                conn.commit()
-        self.logger.info("Data inserted into PostgreSQL successfully")
+    def insert_data(self, batch):
+        if isinstance(batch, dict):
+            batch = [batch]
+        if not batch:
+            return
+        rows = [self._to_row(data) for data in batch]
+        insert_query = sql.SQL("INSERT INTO air_quality ({}) VALUES %s").format(
+            sql.SQL(', ').join(map(sql.Identifier, self.COLUMNS))
+        )
+        conn = self.connect()
+        try:
+            with conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, insert_query, rows, page_size=500)
+                    conn.commit()
+        finally:
+            self.release(conn)
+        self.logger.info(f"{len(rows)} row(s) inserted into PostgreSQL successfully")
 
     
-    @ErrorHandler.handle_errors("PostgreSQLConnector")
-    def fetch_data(self, limit=100):
+    def _normalize_limit(self, limit):
         # limit'in bir tamsayı olduğundan emin olalım
         if isinstance(limit, dict):
             self.logger.warning(f"limit bir sözlük olarak geçirildi: {limit}. Varsayılan değer 100 kullanılıyor.")
-            limit = 100
-        elif not isinstance(limit, int):
+            return 100
+        if not isinstance(limit, int):
             try:
-                limit = int(limit)
+                return int(limit)
             except (ValueError, TypeError):
                 self.logger.warning(f"Geçersiz limit değeri: {limit}. Varsayılan değer 100 kullanılıyor.")
-                limit = 100
+                return 100
+        return limit
+
+    def _select_query(self):
+        return sql.SQL("SELECT {} FROM air_quality ORDER BY timestamp DESC LIMIT %s").format(
+            sql.SQL(', ').join(map(sql.Identifier, self.COLUMNS))
+        )
 
-        query = f"SELECT * FROM air_quality ORDER BY timestamp DESC LIMIT {limit}"
-        self.logger.info(f"Executing query: {query}")  # Log the query for debugging
+    @ErrorHandler.handle_errors("PostgreSQLConnector")
+    def fetch_data(self, limit=100):
+        limit = self._normalize_limit(limit)
+
+        # Sabit sorgu + parametreli LIMIT: SQL enjeksiyonu kapanır ve
+        # sunucu aynı planı yeniden kullanabilir
+        query = self._select_query()
+        self.logger.info(f"Fetching up to {limit} rows from air_quality")
+        conn = None
         try:
-            with self.connect() as conn:
+            conn = self.connect()
+            with conn:
                 with conn.cursor() as cur:
-                    cur.execute(query)
-                    columns = [desc[0] for desc in cur.description]
+                    cur.execute(query, (limit,))
                     results = cur.fetchall()
-                    return [dict(zip(columns, row)) for row in results]
+                    return [dict(zip(self.COLUMNS, row)) for row in results]
         except Exception as e:
             self.logger.error(f"Error in fetch_data: {str(e)}")
             raise
-            
+        finally:
+            self.release(conn)
+
+    def stream_data(self, limit=100, itersize=1000):
+        # Sunucu taraflı (named) cursor ile satırları belleğe toptan almadan akıt
+        limit = self._normalize_limit(limit)
+        conn = self.connect()
+        try:
+            with conn:
+                with conn.cursor(name='air_quality_stream') as cur:
+                    cur.itersize = itersize
+                    cur.execute(self._select_query(), (limit,))
+                    for row in cur:
+                        yield row
+        finally:
+            self.release(conn)
+
+    def fetch_dataframe(self, limit=100, itersize=1000):
+        # Satırları dict listesine çevirmeden doğrudan DataFrame olarak döndür;
+        # tüketici tarafında yeniden sütun çıkarımı gerekmez
+        return pd.DataFrame.from_records(self.stream_data(limit, itersize),
+                                         columns=list(self.COLUMNS))
+
     def test_connection(self):
+        conn = None
         try:
-            with self.connect() as conn:
+            conn = self.connect()
+            with conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT 1")
                     result = cur.fetchone()
@@ -107,4 +167,6 @@ class PostgreSQLConnector:
                         return True
         except Exception as e:
             self.logger.error(f"Database connection test failed: {str(e)}")
+        finally:
+            self.release(conn)
         return False
\ No newline at end of file
@@ -9,12 +9,10 @@ import os
 class FeatureEngineer(ABC):
     @abstractmethod
     def extract_features(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
         pass
 
     @abstractmethod
     def add_rolling_averages(self, df: pd.DataFrame) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
         pass
 
 class BasicFeatureEngineer(FeatureEngineer):
@@ -23,8 +21,6 @@ class BasicFeatureEngineer(FeatureEngineer):
 
     @ErrorHandler.handle_errors("BasicFeatureEngineer")
     def extract_features(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         self.logger.info("Starting feature extraction")
         df = pd.DataFrame(data)
         
@@ -32,32 +28,35 @@ class BasicFeatureEngineer(FeatureEngineer):
         df['hour'] = df['timestamp'].dt.hour
         df['day_of_week'] = df['timestamp'].dt.dayofweek
         
-        for pollutant in ['pm25', 'pm10', 'o3', 'no2', 'so2', 'co']:
-            df[pollutant] = df['iaqi'].apply(lambda x: x.get(pollutant, {}).get('v', None))
-        
+        # iaqi sözlüklerini tek geçişte düzleştir; kirleticiler tek tek apply edilmez
+        pollutants = ['pm25', 'pm10', 'o3', 'no2', 'so2', 'co']
+        iaqi_df = pd.json_normalize([d.get('iaqi') or {} for d in data], max_level=1)
+        iaqi_df = iaqi_df.reindex(columns=[f'{p}.v' for p in pollutants])
+        iaqi_df.columns = pollutants
+        iaqi_df.index = df.index
+        df = pd.concat([df, iaqi_df], axis=1)
+
         self.logger.info(f"Feature extraction completed. DataFrame shape: {df.shape}")
         return df
 
     @ErrorHandler.handle_errors("BasicFeatureEngineer")
     def add_rolling_averages(self, df: pd.DataFrame) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         self.logger.info("Adding rolling averages")
         
         df = df.sort_values('timestamp')
-        
-        for column in ['aqi', 'pm25', 'pm10', 'o3', 'no2', 'so2', 'co']:
-            df[f'{column}_3h_avg'] = df[column].rolling(window=3, min_periods=1).mean()
-            df[f'{column}_24h_avg'] = df[column].rolling(window=24, min_periods=1).mean()
-        
+
+        # Tüm sütunlar için iki çoklu-sütun rolling çağrısı; sütun başına ayrı geçiş yok
+        columns = ['aqi', 'pm25', 'pm10', 'o3', 'no2', 'so2', 'co']
+        avg_3h = df[columns].rolling(window=3, min_periods=1).mean().add_suffix('_3h_avg')
+        avg_24h = df[columns].rolling(window=24, min_periods=1).mean().add_suffix('_24h_avg')
+        df = pd.concat([df, avg_3h, avg_24h], axis=1)
+
         self.logger.info(f"Rolling averages added. New DataFrame shape: {df.shape}")
         return df
 
 class FeatureSaver(ABC):
     @abstractmethod
     def save(self, df: pd.DataFrame, path: str) -> None:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         pass
 
 class CSVFeatureSaver(FeatureSaver):
@@ -66,11 +65,29 @@ class CSVFeatureSaver(FeatureSaver):
 
     @ErrorHandler.handle_errors("CSVFeatureSaver")
     def save(self, df: pd.DataFrame, path: str) -> None:
+        # Round floats once vectorized; float_format would re-format
+        # every cell through a per-cell callback in the writer
+        float_cols = df.select_dtypes(include='float').columns
+        if len(float_cols):
+            df = df.copy()
+            df[float_cols] = df[float_cols].round(2)
+        df.to_csv(path, index=False)
+        self.logger.info(f"Features saved successfully to {path}")
+        self.logger.debug(f"CSV file size: {os.path.getsize(path)} bytes")
+
+class ParquetFeatureSaver(FeatureSaver):
+    def __init__(self):
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
 
-        df.to_csv(path, index=False, float_format='%.2f')
+    @ErrorHandler.handle_errors("ParquetFeatureSaver")
+    def save(self, df: pd.DataFrame, path: str) -> None:
+        # Sütunsal sıkıştırma float biçimlendirmeyi atlar; CSV'ye göre
+        # belirgin şekilde küçük dosya ve hızlı yazma
+        if path.endswith('.csv'):
+            path = path[:-len('.csv')] + '.parquet'
+        df.to_parquet(path, compression='zstd', index=False)
         self.logger.info(f"Features saved successfully to {path}")
-        self.logger.debug(f"CSV file size: {os.path.getsize(path)} bytes")
+        self.logger.debug(f"Parquet file size: {os.path.getsize(path)} bytes")
 
 class FeatureProcessor:
     def __init__(self, engineer: FeatureEngineer, saver: FeatureSaver):
@@ -80,8 +97,6 @@ class FeatureProcessor:
 
     @ErrorHandler.handle_errors("FeatureProcessor")
     def process_and_save_features(self, all_data: List[Dict[str, Any]], save_directory: str) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-        
         if not all_data:
             self.logger.warning("No data collected, cannot extract features.")
             return pd.DataFrame()
@@ -98,7 +113,8 @@ class FeatureProcessor:
 
 class FeatureProcessorFactory:
     @staticmethod
-    def create() -> FeatureProcessor:
+    def create(output_format: str = 'parquet') -> FeatureProcessor:
         engineer = BasicFeatureEngineer()
-        saver = CSVFeatureSaver()
+        # CSV geriye dönük uyumluluk için bayrak arkasında tutulur
+        saver = CSVFeatureSaver() if output_format == 'csv' else ParquetFeatureSaver()
         return FeatureProcessor(engineer, saver)
\ No newline at end of file
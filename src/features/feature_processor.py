@@ -1,7 +1,11 @@
 import os
 import json
+import logging
 from typing import List, Dict, Any, Protocol
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from abc import ABC, abstractmethod
 from datetime import datetime
 from src.utils.logger import LoggerFactory
@@ -24,7 +28,14 @@ class CSVFeatureSaver(FeatureSaver):
 
     def save(self, df: pd.DataFrame, path: str) -> None:
         try:
-            df.to_csv(path, index=False, float_format='%.2f')
+            # Round floats once, then let Arrow's C++ writer stream the table;
+            # to_csv formats every cell through Python-level %.2f formatting
+            float_cols = df.select_dtypes(include='float').columns
+            if len(float_cols):
+                df = df.copy()
+                df[float_cols] = df[float_cols].round(2)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pacsv.write_csv(table, path)
             self.logger.info(f"Features saved successfully to {path}")
             self.logger.debug(f"CSV file size: {os.path.getsize(path)} bytes")
         except PermissionError:
@@ -34,41 +45,96 @@ class CSVFeatureSaver(FeatureSaver):
         except Exception as e:
             self.logger.error(f"Failed to save features to {path}: {str(e)}", exc_info=True)
 
+class ParquetFeatureSaver(FeatureSaver):
+    def __init__(self):
+        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+
+    def save(self, df: pd.DataFrame, path: str) -> None:
+        try:
+            # Columnar snappy-compressed output: no float→text formatting
+            # and several times smaller than CSV for numeric telemetry
+            if path.endswith('.csv'):
+                path = path[:-len('.csv')] + '.parquet'
+            df.to_parquet(path, engine='pyarrow', compression='snappy', index=False)
+            self.logger.info(f"Features saved successfully to {path}")
+            self.logger.debug(f"Parquet file size: {os.path.getsize(path)} bytes")
+        except PermissionError:
+            self.logger.warning(f"Permission denied when trying to save to {path}")
+            alternative_path = os.path.join(os.path.expanduser("~"), f"sakarya_features_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet")
+            self.save(df, alternative_path)
+        except Exception as e:
+            self.logger.error(f"Failed to save features to {path}: {str(e)}", exc_info=True)
+
 class FeatureExtractor(DataFrameProcessor):
+    POLLUTANTS = ('pm25', 'pm10', 'o3', 'no2', 'so2', 'co')
+
     def __init__(self):
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
+        # Scratch matrix reused across calls; batch sizes are stable in
+        # steady-state ingestion, so the allocation happens once and stays warm
+        self._pollutant_buf = None
 
     def extract_features(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
         self.logger.info("Starting feature extraction")
-        df = pd.DataFrame(data)
-        
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        # Extract hour and day of week
-        df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
-        
-        # Extract individual pollutant values
-        for pollutant in ['pm25', 'pm10', 'o3', 'no2', 'so2', 'co']:
-            df[pollutant] = df['iaqi'].apply(lambda x: x.get(pollutant, {}).get('v', None))
-        
+
+        n = len(data)
+        if self._pollutant_buf is None or self._pollutant_buf.shape[0] < n:
+            self._pollutant_buf = np.empty((max(n, 1024), len(self.POLLUTANTS)), dtype=np.float32)
+        buf = self._pollutant_buf[:n]
+        buf.fill(np.nan)
+
+        # Build parallel column lists in a single pass over the raw records;
+        # the nested iaqi dicts are read here and never boxed into a column
+        timestamps, aqi_values, carbon_values = [], [], []
+        for i, row in enumerate(data):
+            timestamps.append(row.get('timestamp'))
+            aqi_values.append(row.get('aqi'))
+            carbon_values.append(row.get('carbon_intensity'))
+            iaqi = row.get('iaqi') or {}
+            for j, pollutant in enumerate(self.POLLUTANTS):
+                value = iaqi.get(pollutant)
+                v = value.get('v') if isinstance(value, dict) else None
+                if v is not None:
+                    buf[i, j] = v
+
+        # The collector emits ISO-8601, so a fixed format takes the C fast
+        # path instead of per-element inference
+        ts = pd.to_datetime(pd.Series(timestamps), format='ISO8601', cache=True)
+
+        # Narrow dtypes: hour/day_of_week fit in int8 and pollutant AQI values
+        # in float32, halving the bytes touched by rolling passes and output
+        # aqi/carbon_intensity arrive from JSON and may be strings or None;
+        # coerce each exactly once instead of a widening object-dtype pass
+        columns = {
+            'timestamp': ts,
+            'aqi': pd.to_numeric(aqi_values, errors='coerce', downcast='float'),
+            'carbon_intensity': pd.to_numeric(carbon_values, errors='coerce', downcast='float'),
+            'hour': ts.dt.hour.astype(np.int8),
+            'day_of_week': ts.dt.dayofweek.astype(np.int8),
+        }
+        for j, pollutant in enumerate(self.POLLUTANTS):
+            columns[pollutant] = buf[:, j]
+        df = pd.DataFrame(columns)
+
         self.logger.info(f"Feature extraction completed. DataFrame shape: {df.shape}")
         return df
 
     def add_rolling_averages(self, df: pd.DataFrame) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-
         self.logger.info("Adding rolling averages")
         
-        # Sort by timestamp to ensure correct rolling average calculation
-        df = df.sort_values('timestamp')
-        
-        # Calculate rolling averages for AQI and each pollutant
-        for column in ['aqi', 'pm25', 'pm10', 'o3', 'no2', 'so2', 'co']:
-            df[f'{column}_3h_avg'] = df[column].rolling(window=3, min_periods=1).mean()
-            df[f'{column}_24h_avg'] = df[column].rolling(window=24, min_periods=1).mean()
-        
+        # Sort by timestamp only when needed; the collector emits rows in
+        # chronological order, so sorting is usually a wasted O(N log N) copy
+        if not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp')
+
+        # One multi-column rolling call per window instead of a separate
+        # pass per column; the window machinery is set up twice, not 14 times
+        columns = ['aqi'] + list(self.POLLUTANTS)
+        numeric = df[columns].astype(np.float32)
+        avg_3h = numeric.rolling(window=3, min_periods=1).mean().add_suffix('_3h_avg')
+        avg_24h = numeric.rolling(window=24, min_periods=1).mean().add_suffix('_24h_avg')
+        df = pd.concat([df, avg_3h, avg_24h], axis=1)
+
         self.logger.info(f"Rolling averages added. New DataFrame shape: {df.shape}")
         return df
 
@@ -79,23 +145,26 @@ class FeatureProcessor:
         self.saver = saver
 
     def process_and_save_features(self, all_data: List[Dict[str, Any]], save_directory: str) -> pd.DataFrame:
-        self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-        
         if not all_data:
             self.logger.warning("No data collected, cannot extract features.")
             return pd.DataFrame()
 
         self.logger.info(f"Processing {len(all_data)} data points.")
-        self.logger.debug(f"Sample data point: {json.dumps(all_data[0], indent=2)}")
-        
+        # json.dumps and .tolist() are only worth computing when DEBUG is on
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            self.logger.debug("Sample data point: %s", json.dumps(all_data[0], indent=2))
+
         try:
             df = self.extractor.extract_features(all_data)
             self.logger.info(f"Features extracted. Shape of DataFrame: {df.shape}")
-            self.logger.debug(f"Columns after extraction: {df.columns.tolist()}")
-            
+            if debug_enabled:
+                self.logger.debug("Columns after extraction: %s", df.columns.tolist())
+
             df = self.extractor.add_rolling_averages(df)
             self.logger.info(f"Rolling averages added. New shape of DataFrame: {df.shape}")
-            self.logger.debug(f"Columns after adding rolling averages: {df.columns.tolist()}")
+            if debug_enabled:
+                self.logger.debug("Columns after adding rolling averages: %s", df.columns.tolist())
             
             output_csv = os.path.join(save_directory, f"sakarya_features_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
             self.saver.save(df, output_csv)
@@ -107,9 +176,10 @@ class FeatureProcessor:
 
 class FeatureProcessorFactory:
     @staticmethod
-    def create() -> FeatureProcessor:
+    def create(output_format: str = 'parquet') -> FeatureProcessor:
         extractor = FeatureExtractor()
-        saver = CSVFeatureSaver()
+        # CSV stays available behind the flag for backward compatibility
+        saver = CSVFeatureSaver() if output_format == 'csv' else ParquetFeatureSaver()
         return FeatureProcessor(extractor, saver)
 
 # Usage
@@ -1,4 +1,5 @@
 import functools
+import random
 from src.utils.logger import LoggerFactory
 import time
 
@@ -18,7 +19,7 @@ class ErrorHandler:
         return decorator
 
     @staticmethod
-    def retry(max_attempts, delay=1):
+    def retry(max_attempts, delay=1, exceptions=(Exception,)):
         def decorator(func):
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
@@ -26,10 +27,13 @@ class ErrorHandler:
                 for attempt in range(max_attempts):
                     try:
                         return func(*args, **kwargs)
-                    except Exception as e:
+                    except exceptions as e:
                         if attempt < max_attempts - 1:
-                            logger.warning(f"Attempt {attempt + 1} failed, retrying in {delay} seconds. Error: {e}")
-                            time.sleep(delay)
+                            # Exponential backoff with jitter: backs off a
+                            # rate-limited endpoint instead of hammering it
+                            sleep_time = delay * (2 ** attempt) + random.uniform(0, 0.1)
+                            logger.warning(f"Attempt {attempt + 1} failed, retrying in {sleep_time:.1f} seconds. Error: {e}")
+                            time.sleep(sleep_time)
                         else:
                             logger.error(f"All {max_attempts} attempts failed. Error: {e}")
                             raise